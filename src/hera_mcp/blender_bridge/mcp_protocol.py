@@ -4,13 +4,51 @@ Minimal JSON-RPC helpers for MCP stdio server.
 
 from __future__ import annotations
 
+import json
 from typing import Any, Dict, Optional
 
+try:  # optional C encoder; Blender's bundled Python usually lacks it
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+
+def encode(obj: Any) -> bytes:
+    """
+    Serialize a payload to UTF-8 JSON bytes, via orjson when available.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass  # e.g. non-str keys or >64-bit ints: let stdlib decide
+    return json.dumps(obj).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+    return encode(obj).decode("utf-8")
+
+
+def decode(raw: bytes) -> Any:
+    """
+    Parse JSON bytes; raises ValueError on malformed JSON or UTF-8.
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 def make_jsonrpc_response(request_id: Any, result: Dict[str, Any]) -> Dict[str, Any]:
     return {"jsonrpc": "2.0", "id": request_id, "result": result}
 
 
+def encode_result(request_id: Any, result_body: bytes) -> bytes:
+    """
+    Serialize a response around an already-encoded result body.
+    """
+    return b'{"jsonrpc":"2.0","id":' + encode(request_id) + b',"result":' + result_body + b"}"
+
+
 def make_error_response(request_id: Any, *, code: int, message: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     error = {"code": code, "message": message}
     if data is not None:
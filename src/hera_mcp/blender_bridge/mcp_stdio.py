@@ -4,12 +4,17 @@ MCP-compatible JSON-RPC stdio server for Blender/headless.
 
 from __future__ import annotations
 
-import json
+import functools
+import importlib
 import sys
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from hera_mcp.blender_bridge import scene_state
 from hera_mcp.blender_bridge.mcp_protocol import (
+    decode,
+    dumps,
+    encode,
+    encode_result,
     make_error_response,
     make_jsonrpc_response,
 )
@@ -18,7 +23,7 @@ from hera_mcp.core import coerce, envelope
 
 def _safe_scene_state() -> Dict[str, Any]:
     try:
-        return scene_state.snapshot().get("scene_state", {})
+        return scene_state.current_state()
     except Exception:
         return {"objects": [], "metadata": {"warning": "scene unavailable"}}
 
@@ -28,51 +33,44 @@ def log_err(message: str) -> None:
     sys.stderr.flush()
 
 
-def _tool_callable(name: str):
-    if name == "hera.health":
-        from hera_mcp.tools.core.health import tool_health
-        return tool_health
-
-    if name == "hera.scene.snapshot":
-        from hera_mcp.tools.scene.snapshot import tool_scene_snapshot
-        return tool_scene_snapshot
-
-    if name == "hera.scene.snapshot_chunk":
-        from hera_mcp.tools.scene.snapshot import tool_scene_snapshot_chunk
-        return tool_scene_snapshot_chunk
-
-    if name == "hera.scene.create_object":
-        from hera_mcp.tools.scene.create_object import tool_create_object
-        return tool_create_object
-
-    if name == "hera.scene.move_object":
-        from hera_mcp.tools.scene.move_object import tool_move_object
-        return tool_move_object
-
-    if name == "hera.object.get":
-        from hera_mcp.tools.scene.get_object import tool_get_object
-        return tool_get_object
+_TOOL_TARGETS: Dict[str, Tuple[str, str]] = {
+    "hera.health": ("hera_mcp.tools.core.health", "tool_health"),
+    "hera.scene.snapshot": ("hera_mcp.tools.scene.snapshot", "tool_scene_snapshot"),
+    "hera.scene.snapshot_chunk": ("hera_mcp.tools.scene.snapshot", "tool_scene_snapshot_chunk"),
+    "hera.scene.create_object": ("hera_mcp.tools.scene.create_object", "tool_create_object"),
+    "hera.scene.move_object": ("hera_mcp.tools.scene.move_object", "tool_move_object"),
+    "hera.object.get": ("hera_mcp.tools.scene.get_object", "tool_get_object"),
+    "hera.object.set_transform": ("hera_mcp.tools.scene.set_transform", "tool_set_transform"),
+    "hera.ops.status": ("hera_mcp.tools.core.ops", "tool_ops_status"),
+    "hera.ops.cancel": ("hera_mcp.tools.core.ops", "tool_ops_cancel"),
+    "hera.ops.resume": ("hera_mcp.tools.core.ops", "tool_ops_resume"),
+}
 
-    if name == "hera.object.set_transform":
-        from hera_mcp.tools.scene.set_transform import tool_set_transform
-        return tool_set_transform
 
-    if name == "hera.ops.status":
-        from hera_mcp.tools.core.ops import tool_ops_status
-        return tool_ops_status
-
-    if name == "hera.ops.cancel":
-        from hera_mcp.tools.core.ops import tool_ops_cancel
-        return tool_ops_cancel
+def _tool_callable(name: str):
+    """
+    Resolve a tool name with one dict lookup; tool modules are still imported
+    lazily, on first call, so startup stays cheap.
+    """
+    target = _TOOL_TARGETS.get(name)
+    if target is None:
+        return None
+    return _resolve_target(target)
 
-    if name == "hera.ops.resume":
-        from hera_mcp.tools.core.ops import tool_ops_resume
-        return tool_ops_resume
 
-    return None
+# Keyed by _TOOL_TARGETS entries only, so unknown names sent by a client
+# never grow the cache.
+@functools.lru_cache(maxsize=None)
+def _resolve_target(target: Tuple[str, str]):
+    module_name, attr = target
+    return getattr(importlib.import_module(module_name), attr)
 
 
+@functools.lru_cache(maxsize=None)
 def _tool_definitions() -> List[Dict[str, Any]]:
+    """
+    Static tool schemas, built once per process and shared by all servers.
+    """
     return [
         {
             "name": "hera.health",
@@ -178,36 +176,72 @@ def _tool_definitions() -> List[Dict[str, Any]]:
     ]
 
 
+@functools.lru_cache(maxsize=None)
+def _static_results() -> Dict[str, Dict[str, Any]]:
+    """
+    Results that depend only on the method, never on request params.
+    """
+    return {
+        "initialize": {
+            "protocolVersion": "2024-11-05",
+            "serverInfo": {"name": "hera-mcp", "version": "0.1.0"},
+            "capabilities": {"tools": {}, "resources": {}, "prompts": {}},
+        },
+        "ping": {"ok": True},
+        "tools/list": {"tools": _tool_definitions()},
+        "resources/list": {"resources": []},
+        "prompts/list": {"prompts": []},
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _static_bodies() -> Dict[str, bytes]:
+    return {method: encode(result) for method, result in _static_results().items()}
+
+
+def _log_request(request: Dict[str, Any]) -> None:
+    params = request.get("params")
+    keys = list(params.keys()) if isinstance(params, dict) else type(params)
+    log_err(f"[mcp] <- method={request.get('method')} id={request.get('id')} keys={keys}")
+
+
 class MCPStdioServer:
     def __init__(self) -> None:
         self._tools = _tool_definitions()
+        self._static_results = _static_results()
+        self._static_bodies = _static_bodies()
         self._shutdown = False
         self._exit = False
 
+    def handle_message(self, message: Any) -> Optional[bytes]:
+        """
+        Serialized counterpart of handle_request. Static results are spliced
+        from pre-encoded bytes; only the request id is serialized per call.
+        """
+        method = message.get("method") if isinstance(message, dict) else None
+        # Only string methods can name a static result; anything else (even
+        # unhashable) goes through handle_request and its error handling.
+        if isinstance(method, str):
+            body = self._static_bodies.get(method)
+            if body is not None:
+                _log_request(message)
+                return encode_result(message.get("id"), body)
+        resp = self.handle_request(message)
+        return encode(resp) if resp is not None else None
+
     def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any | None]:
         try:
             method = request.get("method")
             request_id = request.get("id")
             params = request.get("params")
-            keys = list(params.keys()) if isinstance(params, dict) else type(params)
-            log_err(f"[mcp] <- method={method} id={request_id} keys={keys}")
+            _log_request(request)
 
             if method == "notifications/initialized":
                 return None
 
-            if method == "initialize":
-                result = {
-                    "protocolVersion": "2024-11-05",
-                    "serverInfo": {"name": "hera-mcp", "version": "0.1.0"},
-                    "capabilities": {"tools": {}, "resources": {}, "prompts": {}},
-                }
-                return make_jsonrpc_response(request_id, result)
-
-            if method == "ping":
-                return make_jsonrpc_response(request_id, {"ok": True})
-
-            if method == "tools/list":
-                return make_jsonrpc_response(request_id, {"tools": self._tools})
+            static = self._static_results.get(method) if isinstance(method, str) else None
+            if static is not None:
+                return make_jsonrpc_response(request_id, static)
 
             if method == "tools/call":
                 params = params or {}
@@ -218,12 +252,6 @@ class MCPStdioServer:
                 )
                 return self._handle_tool_call(request_id, name, arguments)
 
-            if method == "resources/list":
-                return make_jsonrpc_response(request_id, {"resources": []})
-
-            if method == "prompts/list":
-                return make_jsonrpc_response(request_id, {"prompts": []})
-
             if method == "shutdown":
                 self._shutdown = True
                 return make_jsonrpc_response(request_id, {"ok": True})
@@ -243,7 +271,7 @@ class MCPStdioServer:
                     "isError": True,
                     "content": [
                         {"type": "text", "text": f"Error: {exc}"},
-                        {"type": "text", "text": json.dumps(err_payload)},
+                        {"type": "text", "text": dumps(err_payload)},
                     ],
                 },
             )
@@ -261,7 +289,7 @@ class MCPStdioServer:
                     "isError": True,
                     "content": [
                         {"type": "text", "text": f"Error: Unsupported tool {name}"},
-                        {"type": "text", "text": json.dumps(err)},
+                        {"type": "text", "text": dumps(err)},
                     ],
                 },
             )
@@ -278,13 +306,13 @@ class MCPStdioServer:
                     "isError": True,
                     "content": [
                         {"type": "text", "text": f"Error: {exc}"},
-                        {"type": "text", "text": json.dumps(err)},
+                        {"type": "text", "text": dumps(err)},
                     ],
                 },
             )
 
         is_error = result.get("status") in ("error", "failed")
-        payload = json.dumps(result)
+        payload = dumps(result)
         content = [{"type": "text", "text": payload}]
         if is_error:
             content = [
@@ -294,44 +322,69 @@ class MCPStdioServer:
         return make_jsonrpc_response(request_id, {"isError": is_error, "content": content})
 
     def _coerce_arguments(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        args: Dict[str, Any] = {}
-        if name == "hera.scene.snapshot":
-            args["limit_objects"] = int(coerce.to_float(arguments.get("limit_objects", arguments.get("limit", 100))))
-            args["offset"] = int(coerce.to_float(arguments.get("offset", 0)))
-        elif name == "hera.scene.snapshot_chunk":
-            token = arguments.get("token") or arguments.get("resume_token") or ""
-            args["token"] = str(token)
-        elif name == "hera.scene.create_object":
-            args["type"] = str(arguments.get("type", "CUBE"))
-            args["name"] = coerce.to_name(arguments.get("name", "Object"))
-            args["location"] = coerce.to_vector3(arguments.get("location"))
-            args["light_type"] = str(arguments.get("light_type", "POINT"))
-        elif name == "hera.scene.move_object":
-            args["name"] = coerce.to_name(arguments.get("name") or arguments.get("object"))
-            if "location" in arguments:
-                args["location"] = coerce.to_vector3(arguments.get("location"))
-            if "delta" in arguments:
-                args["delta"] = coerce.to_vector3(arguments.get("delta"))
-        elif name == "hera.object.get":
-            args["name"] = coerce.to_name(arguments.get("name") or arguments.get("object"))
-        
-
-        elif name == "hera.object.set_transform":
-            args["name"] = coerce.to_name(arguments.get("name") or arguments.get("object"))
-            if "location" in arguments:
-                args["location"] = coerce.to_vector3(arguments.get("location"))
-            if "rotation_euler" in arguments:
-                args["rotation_euler"] = coerce.to_vector3(arguments.get("rotation_euler"))
-            if "scale" in arguments:
-                args["scale"] = coerce.to_vector3(arguments.get("scale"))
-elif name in ("hera.ops.status", "hera.ops.cancel"):
-            args["operation_id"] = str(arguments.get("operation_id", ""))
-        elif name == "hera.ops.resume":
-            args["resume_token"] = str(arguments.get("resume_token", ""))
-        else:
-            args.update(arguments)
+        coercer = _ARGUMENT_COERCERS.get(name)
+        if coercer is None:
+            return dict(arguments)
+        return coercer(arguments)
+
+
+def _coerce_snapshot(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "limit_objects": int(coerce.to_float(arguments.get("limit_objects", arguments.get("limit", 100)))),
+        "offset": int(coerce.to_float(arguments.get("offset", 0))),
+    }
+
+
+def _coerce_snapshot_chunk(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    token = arguments.get("token") or arguments.get("resume_token") or ""
+    return {"token": str(token)}
+
+
+def _coerce_create_object(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "type": str(arguments.get("type", "CUBE")),
+        "name": coerce.to_name(arguments.get("name", "Object")),
+        "location": coerce.to_vector3(arguments.get("location")),
+        "light_type": str(arguments.get("light_type", "POINT")),
+    }
+
+
+def _coerce_object_name(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    return {"name": coerce.to_name(arguments.get("name") or arguments.get("object"))}
+
+
+def _coerce_transform(*vector_keys: str) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    def _coerce(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        args = _coerce_object_name(arguments)
+        for key in vector_keys:
+            if key in arguments:
+                args[key] = coerce.to_vector3(arguments.get(key))
         return args
 
+    return _coerce
+
+
+def _coerce_operation_id(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    return {"operation_id": str(arguments.get("operation_id", ""))}
+
+
+def _coerce_resume_token(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    return {"resume_token": str(arguments.get("resume_token", ""))}
+
+
+# Per-tool argument coercion; tools without an entry get their arguments as-is.
+_ARGUMENT_COERCERS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "hera.scene.snapshot": _coerce_snapshot,
+    "hera.scene.snapshot_chunk": _coerce_snapshot_chunk,
+    "hera.scene.create_object": _coerce_create_object,
+    "hera.scene.move_object": _coerce_transform("location", "delta"),
+    "hera.object.get": _coerce_object_name,
+    "hera.object.set_transform": _coerce_transform("location", "rotation_euler", "scale"),
+    "hera.ops.status": _coerce_operation_id,
+    "hera.ops.cancel": _coerce_operation_id,
+    "hera.ops.resume": _coerce_resume_token,
+}
+
 
 def main() -> None:
     """
@@ -340,19 +393,19 @@ def main() -> None:
     server = MCPStdioServer()
     log_err("hera-mcp stdio server starting")
 
-    for raw in sys.stdin:
+    for raw in sys.stdin.buffer:
         line = raw.strip()
         if not line:
             continue
         try:
-            message = json.loads(line)
-        except json.JSONDecodeError:
-            resp = make_error_response(None, code=-32700, message="Invalid JSON")
+            message = decode(line)
+        except ValueError:
+            out = encode(make_error_response(None, code=-32700, message="Invalid JSON"))
         else:
-            resp = server.handle_request(message)
-        if resp is not None:
-            sys.stdout.write(json.dumps(resp) + "\n")
-            sys.stdout.flush()
+            out = server.handle_message(message)
+        if out is not None:
+            sys.stdout.buffer.write(out + b"\n")
+            sys.stdout.buffer.flush()
         if server._exit or server._shutdown:
             break
 
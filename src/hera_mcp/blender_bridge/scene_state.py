@@ -46,7 +46,8 @@ def snapshot(
         state = {"objects": [], "metadata": {"scene": "none", "count": 0}}
         return {"scene_state": state, "resume_token": None, "next_actions": None}
     scene = _active_scene(bpy_module)
-    objects = list(scene.objects) if scene else []
+    # Slice the collection directly; only the requested chunk is materialized.
+    objects = scene.objects if scene else []
     chunk, resume_token = envelope.chunk_list(objects, chunk_size=limit, offset=offset)
     object_payload: List[Dict[str, Any]] = [compact_object(obj) for obj in chunk]
     total = len(objects)
@@ -67,6 +68,22 @@ def snapshot(
     }
 
 
+def current_state() -> Dict[str, Any]:
+    """
+    Scene state block of a fresh snapshot (shared provider for tools).
+    """
+    return snapshot().get("scene_state") or {}
+
+
+def current_state_ok() -> Dict[str, Any]:
+    """
+    Same as current_state(), flagged ok for success envelopes.
+    """
+    ss = current_state()
+    ss["ok"] = True
+    return ss
+
+
 def _next_actions(resume_token: Optional[Dict[str, Any]]) -> Optional[List[str]]:
     if not resume_token:
         return None
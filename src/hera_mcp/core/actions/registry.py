@@ -10,6 +10,7 @@ Design:
 from __future__ import annotations
 
 import importlib
+from array import array
 from typing import Any, Dict, Optional
 
 from hera_mcp.blender_bridge import scene_state
@@ -18,6 +19,29 @@ from hera_mcp.core.coerce import to_name, to_vector3
 
 from .models import ActionContext, ActionOutput
 
+# Unit cube as flat buffers for foreach_set: one C-level copy per attribute
+# instead of from_pydata walking Python tuples.
+_CUBE_CO = array("f", (
+    -0.5, -0.5, -0.5,
+    0.5, -0.5, -0.5,
+    0.5, 0.5, -0.5,
+    -0.5, 0.5, -0.5,
+    -0.5, -0.5, 0.5,
+    0.5, -0.5, 0.5,
+    0.5, 0.5, 0.5,
+    -0.5, 0.5, 0.5,
+))
+_CUBE_LOOP_VERTS = array("i", (
+    0, 1, 2, 3,
+    4, 5, 6, 7,
+    0, 1, 5, 4,
+    2, 3, 7, 6,
+    1, 2, 6, 5,
+    0, 3, 7, 4,
+))
+_CUBE_LOOP_START = array("i", range(0, len(_CUBE_LOOP_VERTS), 4))
+_CUBE_LOOP_TOTAL = array("i", [4] * len(_CUBE_LOOP_START))
+
 
 # ---------------------------
 # Registry
@@ -67,26 +91,16 @@ class SceneCreateObject:
     @staticmethod
     def _create_cube(bpy_module, name: str, location):
         mesh = bpy_module.data.meshes.new(f"{name}_mesh")
-        verts = [
-            (-0.5, -0.5, -0.5),
-            (0.5, -0.5, -0.5),
-            (0.5, 0.5, -0.5),
-            (-0.5, 0.5, -0.5),
-            (-0.5, -0.5, 0.5),
-            (0.5, -0.5, 0.5),
-            (0.5, 0.5, 0.5),
-            (-0.5, 0.5, 0.5),
-        ]
-        faces = [
-            (0, 1, 2, 3),
-            (4, 5, 6, 7),
-            (0, 1, 5, 4),
-            (2, 3, 7, 6),
-            (1, 2, 6, 5),
-            (0, 3, 7, 4),
-        ]
-        mesh.from_pydata(verts, [], faces)
-        mesh.update()
+        mesh.vertices.add(len(_CUBE_CO) // 3)
+        mesh.vertices.foreach_set("co", _CUBE_CO)
+        mesh.loops.add(len(_CUBE_LOOP_VERTS))
+        mesh.loops.foreach_set("vertex_index", _CUBE_LOOP_VERTS)
+        mesh.polygons.add(len(_CUBE_LOOP_START))
+        mesh.polygons.foreach_set("loop_start", _CUBE_LOOP_START)
+        if tuple(bpy_module.app.version) < (4, 0, 0):
+            # loop_total became read-only (derived from loop_start) in 4.0
+            mesh.polygons.foreach_set("loop_total", _CUBE_LOOP_TOTAL)
+        mesh.update(calc_edges=True)
         obj = bpy_module.data.objects.new(name, mesh)
         obj.location = location
         return obj
@@ -157,6 +171,8 @@ class SceneCreateObject:
 
         diff = {"created": [obj.name], "modified": [], "deleted": []}
         snap = scene_state.snapshot()
+        ss = snap.get("scene_state") or {}
+        ss["ok"] = True
 
         return ActionOutput(
             status="success",
@@ -164,7 +180,7 @@ class SceneCreateObject:
                 "object": {"name": obj.name, "type": obj.type, "location": list(obj.location)},
                 "diff": diff,
             },
-            scene_state={**(snap.get("scene_state") or {}), "ok": True},
+            scene_state=ss,
             resume_token=snap.get("resume_token"),
             next_actions=snap.get("next_actions"),
         )
@@ -196,23 +212,23 @@ class SceneMoveObject:
                 ),
             )
 
+        # Write through the existing location vector (slice assignment) instead of
+        # rebuilding a tuple and letting RNA coerce it into a new Vector.
+        loc = obj.location
         if absolute_loc is not None:
-            obj.location = absolute_loc
+            loc[:] = absolute_loc
         else:
-            current = to_vector3(getattr(obj, "location", (0.0, 0.0, 0.0)))
-            obj.location = (
-                float(current[0]) + delta[0],
-                float(current[1]) + delta[1],
-                float(current[2]) + delta[2],
-            )
+            loc[:] = (loc[0] + delta[0], loc[1] + delta[1], loc[2] + delta[2])
 
         diff = {"created": [], "modified": [obj.name], "deleted": []}
         snap = scene_state.snapshot()
+        ss = snap.get("scene_state") or {}
+        ss["ok"] = True
 
         return ActionOutput(
             status="success",
             data={"object": {"name": obj.name, "location": list(obj.location)}, "diff": diff},
-            scene_state={**(snap.get("scene_state") or {}), "ok": True},
+            scene_state=ss,
             resume_token=snap.get("resume_token"),
             next_actions=snap.get("next_actions"),
         )
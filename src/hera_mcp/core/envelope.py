@@ -5,6 +5,7 @@ Envelope builders and chunking helpers for HERA MCP.
 from __future__ import annotations
 
 import time
+from collections.abc import Mapping
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 DEFAULT_CHUNK_SIZE = 100
@@ -56,15 +57,19 @@ def chunk_list(
 ) -> Tuple[List[Any], Optional[Dict[str, Any]]]:
     """
     Chunk a list-like iterable. Returns (chunk, resume_token).
+    Sized, sliceable inputs (lists, bpy collections) are sliced in place
+    rather than copied whole.
     """
     if chunk_size <= 0:
         chunk_size = DEFAULT_CHUNK_SIZE
-    items_list = list(items)
+    if isinstance(items, Mapping) or not (hasattr(items, "__len__") and hasattr(items, "__getitem__")):
+        items = list(items)
+    total = len(items)
     end = offset + chunk_size
-    chunk = items_list[offset:end]
+    chunk = list(items[offset:end])
     resume_token = None
-    if end < len(items_list):
-        resume_token = {"offset": end, "total": len(items_list)}
+    if end < total:
+        resume_token = {"offset": end, "total": total}
     return chunk, resume_token
 
 
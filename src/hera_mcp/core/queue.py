@@ -15,10 +15,11 @@ T = TypeVar("T")
 class MonoQueue:
     """
     Guards execution with a single lock to prevent concurrent Blender mutations.
+    Nested calls from the thread already inside the gate run inline.
     """
 
     def __init__(self) -> None:
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()
 
     def run(self, func: Callable[..., T], *args, **kwargs) -> T:
         with self._lock:
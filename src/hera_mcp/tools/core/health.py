@@ -6,12 +6,6 @@ from hera_mcp.blender_bridge import scene_state
 from hera_mcp.core.safe_exec import safe_execute
 
 
-def _scene_state_provider() -> Dict[str, Any]:
-    snap = scene_state.snapshot()
-    ss = snap.get("scene_state") or {}
-    return {**ss, "ok": True}
-
-
 def run(params: Dict[str, Any] | None = None) -> Dict[str, Any]:
     """
     Health check envelope; always includes scene_state.
@@ -24,7 +18,7 @@ def run(params: Dict[str, Any] | None = None) -> Dict[str, Any]:
             limit=int(params.get("limit") or 25),
         )
         ss = snap.get("scene_state") or {}
-        ss = {**ss, "ok": True}
+        ss["ok"] = True
         return {
             "status": "success",
             "data": {"ok": True, "diff": {"created": [], "modified": [], "deleted": []}},
@@ -33,7 +27,7 @@ def run(params: Dict[str, Any] | None = None) -> Dict[str, Any]:
             "next_actions": snap.get("next_actions"),
         }
 
-    return safe_execute("hera.health", _op, _scene_state_provider)
+    return safe_execute("hera.health", _op, scene_state.current_state_ok)
 
 
 def tool_health() -> Dict[str, Any]:
@@ -11,10 +11,6 @@ from hera_mcp.core.queue import operation_manager
 from hera_mcp.core.safe_exec import safe_execute
 
 
-def _scene_state_provider() -> Dict[str, Any]:
-    return scene_state.snapshot().get("scene_state", {})
-
-
 def tool_ops_status(operation_id: str) -> Dict[str, Any]:
     def _op():
         record = operation_manager.get(operation_id)
@@ -37,10 +33,10 @@ def tool_ops_status(operation_id: str) -> Dict[str, Any]:
                 "error": record.error,
                 "cancel_requested": record.cancel_requested,
             },
-            "scene_state": {**(_scene_state_provider() or {}), "ok": True},
+            "scene_state": scene_state.current_state_ok(),
         }
 
-    return safe_execute("hera.ops.status", _op, _scene_state_provider)
+    return safe_execute("hera.ops.status", _op, scene_state.current_state)
 
 
 def tool_ops_cancel(operation_id: str) -> Dict[str, Any]:
@@ -63,10 +59,10 @@ def tool_ops_cancel(operation_id: str) -> Dict[str, Any]:
                 "state": record.status if record else "canceled",
                 "cancel_requested": True,
             },
-            "scene_state": {**(_scene_state_provider() or {}), "ok": True},
+            "scene_state": scene_state.current_state_ok(),
         }
 
-    return safe_execute("hera.ops.cancel", _op, _scene_state_provider)
+    return safe_execute("hera.ops.cancel", _op, scene_state.current_state)
 
 
 def tool_ops_resume(resume_token: str) -> Dict[str, Any]:
@@ -78,7 +74,7 @@ def tool_ops_resume(resume_token: str) -> Dict[str, Any]:
         return {
             "status": "partial",
             "data": {"resume_token": resume_token},
-            "scene_state": {**(_scene_state_provider() or {}), "ok": True},
+            "scene_state": scene_state.current_state_ok(),
         }
 
-    return safe_execute("hera.ops.resume", _op, _scene_state_provider)
+    return safe_execute("hera.ops.resume", _op, scene_state.current_state)
@@ -16,10 +16,6 @@ from hera_mcp.core.actions.models import ActionContext
 from hera_mcp.core.actions.runner import run_action
 
 
-def _scene_state_provider() -> Dict[str, Any]:
-    return scene_state.snapshot().get("scene_state", {})
-
-
 def run(params: Dict[str, Any] | None = None) -> Dict[str, Any]:
     params = params or {}
 
@@ -37,10 +33,10 @@ def run(params: Dict[str, Any] | None = None) -> Dict[str, Any]:
     }
 
     def _op():
-        ctx = ActionContext(scene_state_provider=_scene_state_provider, extras={})
+        ctx = ActionContext(scene_state_provider=scene_state.current_state, extras={})
         return run_action("scene.create_object", action_params, ctx)
 
-    return mono_queue.run(lambda: safe_execute("scene.create_object", _op, _scene_state_provider))
+    return mono_queue.run(lambda: safe_execute("scene.create_object", _op, scene_state.current_state))
 
 
 def tool_create_object(
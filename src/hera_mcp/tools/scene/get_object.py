@@ -11,6 +11,21 @@ from time import perf_counter
 from hera_mcp.blender_bridge import scene_state
 
 
+# Static part of every error envelope; copied and patched per call.
+_ERROR_TEMPLATE: Dict[str, Any] = {"status": "error", "operation": "object.get"}
+# scene_state metadata for the no-Blender path (contract: always present).
+_NO_SCENE_METADATA: Dict[str, Any] = {"scene": "none", "count": 0}
+
+
+def _error(message: str, scene: Dict[str, Any], t0: float) -> Dict[str, Any]:
+    env = _ERROR_TEMPLATE.copy()
+    env["error"] = message
+    env["scene_state"] = scene
+    env["data"] = {"object": None}
+    env["metrics"] = {"duration_ms": int((perf_counter() - t0) * 1000)}
+    return env
+
+
 def tool_get_object(name: str) -> Dict[str, Any]:
     t0 = perf_counter()
 
@@ -18,38 +33,27 @@ def tool_get_object(name: str) -> Dict[str, Any]:
     try:
         import bpy  # type: ignore
     except Exception as exc:
-        return {
-            "status": "error",
-            "operation": "object.get",
-            "error": f"bpy unavailable (must run inside Blender): {exc}",
-            "scene_state": scene_state.snapshot().get("scene_state", {}),
-            "data": {"object": None},
-            "metrics": {"duration_ms": int((perf_counter() - t0) * 1000)},
-        }
+        # No Blender, no scene: skip the snapshot entirely.
+        scene = {"objects": [], "metadata": dict(_NO_SCENE_METADATA)}
+        return _error(f"bpy unavailable (must run inside Blender): {exc}", scene, t0)
 
     obj = bpy.data.objects.get(name)
     if obj is None:
-        return {
-            "status": "error",
-            "operation": "object.get",
-            "error": f"Object not found: {name}",
-            "scene_state": scene_state.snapshot().get("scene_state", {}),
-            "data": {"object": None},
-            "metrics": {"duration_ms": int((perf_counter() - t0) * 1000)},
-        }
+        return _error(f"Object not found: {name}", scene_state.current_state(), t0)
 
     data = {
         "name": obj.name,
         "type": obj.type,
-        "location": [float(obj.location.x), float(obj.location.y), float(obj.location.z)],
-        "rotation_euler": [float(obj.rotation_euler.x), float(obj.rotation_euler.y), float(obj.rotation_euler.z)],
-        "scale": [float(obj.scale.x), float(obj.scale.y), float(obj.scale.z)],
+        # list() copies mathutils vectors in one C call and already yields floats
+        "location": list(obj.location),
+        "rotation_euler": list(obj.rotation_euler),
+        "scale": list(obj.scale),
     }
 
     return {
         "status": "success",
         "operation": "object.get",
-        "scene_state": scene_state.snapshot().get("scene_state", {}),
+        "scene_state": scene_state.current_state(),
         "data": {"object": data},
         "metrics": {"duration_ms": int((perf_counter() - t0) * 1000)},
     }
@@ -16,10 +16,6 @@ from hera_mcp.core.actions.models import ActionContext
 from hera_mcp.core.actions.runner import run_action
 
 
-def _scene_state_provider() -> Dict[str, Any]:
-    return scene_state.snapshot().get("scene_state", {})
-
-
 def run(params: Dict[str, Any] | None = None) -> Dict[str, Any]:
     params = params or {}
     name = to_name(params.get("name") or params.get("object"))
@@ -34,10 +30,10 @@ def run(params: Dict[str, Any] | None = None) -> Dict[str, Any]:
         action_params["delta"] = delta
 
     def _op():
-        ctx = ActionContext(scene_state_provider=_scene_state_provider, extras={})
+        ctx = ActionContext(scene_state_provider=scene_state.current_state, extras={})
         return run_action("scene.move_object", action_params, ctx)
 
-    return mono_queue.run(lambda: safe_execute("scene.move_object", _op, _scene_state_provider))
+    return mono_queue.run(lambda: safe_execute("scene.move_object", _op, scene_state.current_state))
 
 
 def tool_move_object(
@@ -8,7 +8,9 @@ from pathlib import Path
 # Ensure repo "src/" is importable inside Blender's Python
 REPO_ROOT = Path(__file__).resolve().parents[2]  # D:\HERA
 SRC_DIR = REPO_ROOT / "src"
-if str(SRC_DIR) not in sys.path:
+# Compare resolved paths so reruns in the same Blender session never stack
+# duplicate (differently spelled) entries.
+if SRC_DIR not in {Path(p).resolve() for p in sys.path if p}:
     sys.path.insert(0, str(SRC_DIR))
 
 from hera_mcp.tools.core.health import tool_health
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from hera_mcp.tools.scene.get_object import tool_get_object
+
+
+def test_no_blender_keeps_contract_scene_state():
+    first = tool_get_object("Cube")
+    assert first["status"] == "error"
+    assert first["scene_state"] == {"objects": [], "metadata": {"scene": "none", "count": 0}}
+
+    first["scene_state"]["objects"].append("x")
+    first["scene_state"]["metadata"]["count"] = 9
+    assert tool_get_object("Cube")["scene_state"] == {"objects": [], "metadata": {"scene": "none", "count": 0}}
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from hera_mcp.blender_bridge import mcp_stdio
+from hera_mcp.blender_bridge.mcp_stdio import MCPStdioServer
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+
+def test_tools_list_is_built_once_per_process():
+    a = MCPStdioServer().handle_request({"jsonrpc": "2.0", "id": 1, "method": "tools/list"})
+    b = MCPStdioServer().handle_request({"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+    assert a["id"] == 1 and b["id"] == 2
+    assert a["result"]["tools"] is b["result"]["tools"]
+    names = {t["name"] for t in a["result"]["tools"]}
+    assert {"hera.health", "hera.scene.snapshot", "hera.object.get"} <= names
+
+
+def test_unknown_tool_is_error_result():
+    resp = MCPStdioServer().handle_request(
+        {"jsonrpc": "2.0", "id": 3, "method": "tools/call", "params": {"name": "hera.nope", "arguments": {}}}
+    )
+    assert resp["result"]["isError"] is True
+
+
+def test_static_results_splice_request_id():
+    server = MCPStdioServer()
+    for method in ("initialize", "ping", "tools/list", "resources/list", "prompts/list"):
+        for request_id in (7, "a\"b", None):
+            request = {"jsonrpc": "2.0", "id": request_id, "method": method}
+            assert json.loads(server.handle_message(request)) == server.handle_request(request)
+
+
+def test_unknown_tool_names_are_not_cached():
+    before = mcp_stdio._resolve_target.cache_info().currsize
+    for i in range(50):
+        assert mcp_stdio._tool_callable(f"hera.nope.{i}") is None
+    assert mcp_stdio._resolve_target.cache_info().currsize == before
+
+
+def test_non_string_method_is_an_error_and_loop_survives():
+    requests = (
+        b'{"jsonrpc":"2.0","id":1,"method":["x"]}\n'
+        b'{"jsonrpc":"2.0","id":2,"method":{"a":1}}\n'
+        b'{"jsonrpc":"2.0","id":3,"method":"ping"}\n'
+    )
+    proc = subprocess.run(
+        [sys.executable, "-m", "hera_mcp"],
+        input=requests,
+        capture_output=True,
+        timeout=30,
+        env={**os.environ, "PYTHONPATH": str(SRC_DIR)},
+    )
+    assert proc.returncode == 0
+    responses = [json.loads(line) for line in proc.stdout.splitlines()]
+    assert [r["id"] for r in responses] == [1, 2, 3]
+    assert responses[0]["error"]["code"] == -32601
+    assert responses[1]["error"]["code"] == -32601
+    assert responses[2]["result"] == {"ok": True}
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import threading
+
+from hera_mcp.core.queue import MonoQueue
+
+
+def test_nested_run_on_owner_thread_is_inline():
+    q = MonoQueue()
+    assert q.run(lambda: q.run(lambda: 42)) == 42
+
+
+def test_run_serializes_other_threads():
+    q = MonoQueue()
+    inside = threading.Event()
+    release = threading.Event()
+    order = []
+
+    def slow():
+        inside.set()
+        release.wait(5)
+        order.append("first")
+
+    t = threading.Thread(target=q.run, args=(slow,))
+    t.start()
+    inside.wait(5)
+    t2 = threading.Thread(target=q.run, args=(lambda: order.append("second"),))
+    t2.start()
+    t2.join(0.1)
+    assert order == []
+    release.set()
+    t.join(5)
+    t2.join(5)
+    assert order == ["first", "second"]
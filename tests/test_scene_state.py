@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from hera_mcp.blender_bridge import scene_state
+
+
+def make_bpy(count: int):
+    objects = [
+        SimpleNamespace(name=f"Obj{i:03d}", type="MESH", location=(float(i), 0.0, 0.0))
+        for i in range(count)
+    ]
+    scene = SimpleNamespace(name="Scene", objects=objects)
+    return SimpleNamespace(data=SimpleNamespace(scenes=[scene]), context=SimpleNamespace(scene=scene))
+
+
+def test_snapshot_chunks_and_tokens():
+    bpy = make_bpy(150)
+    snap = scene_state.snapshot(bpy_module=bpy, offset=0, limit=100)
+    assert len(snap["scene_state"]["objects"]) == 100
+    assert snap["resume_token"] == {"offset": 100, "total": 150}
+    decoded = scene_state.decode_token(snap["chunk_token"])
+    assert decoded == {"offset": 100, "limit": 100, "total": 150}
+
+    tail = scene_state.snapshot(bpy_module=bpy, offset=decoded["offset"], limit=decoded["limit"])
+    assert [o["name"] for o in tail["scene_state"]["objects"]][0] == "Obj100"
+    assert tail["chunk_token"] is None
+
+
+def test_snapshots_are_not_shared_between_callers():
+    bpy = make_bpy(5)
+    first = scene_state.snapshot(bpy_module=bpy)
+    first["scene_state"]["ok"] = True
+    first["scene_state"]["objects"].clear()
+
+    second = scene_state.snapshot(bpy_module=bpy)
+    assert "ok" not in second["scene_state"]
+    assert len(second["scene_state"]["objects"]) == 5
+
+
+def test_snapshot_reflects_in_place_edits():
+    # Edits that keep the object count (transforms, renames, UI, undo) must
+    # show up on the next snapshot.
+    bpy = make_bpy(3)
+    scene_state.snapshot(bpy_module=bpy)
+    obj = bpy.data.scenes[0].objects[0]
+    obj.location = (9.0, 9.0, 9.0)
+    obj.name = "Renamed"
+    first = scene_state.snapshot(bpy_module=bpy)["scene_state"]["objects"][0]
+    assert first == {"name": "Renamed", "type": "MESH", "location": [9.0, 9.0, 9.0]}
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+_spec = importlib.util.spec_from_file_location("stdio_filter", REPO_ROOT / "tools" / "stdio_filter.py")
+stdio_filter = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(stdio_filter)
+
+
+def frame(stream: bytes, seed: int = 0):
+    """
+    Feed stream to a fresh router in random-sized chunks; return (json, noise).
+    """
+    rng = random.Random(seed)
+    router = stdio_filter.LineRouter()
+    json_out, noise = bytearray(), bytearray()
+    i = 0
+    while i < len(stream):
+        step = rng.randint(1, 7)
+        for is_json, data in router.feed(stream[i : i + step]):
+            (json_out if is_json else noise).extend(data)
+        i += step
+    noise += router.flush()
+    return bytes(json_out), bytes(noise)
+
+
+def rpc(i: int) -> bytes:
+    return json.dumps({"jsonrpc": "2.0", "id": i, "result": {"text": 'a "{[" \\ b'}}).encode()
+
+
+def test_values_and_noise_survive_any_chunking():
+    stream = (
+        b"Blender 5.0 starting\n"
+        + rpc(1) + b"\n"
+        + b"[hera] loaded\n"
+        + b"  " + rpc(2) + b"\r\n"
+        + b'[{"jsonrpc":"2.0","id":3,"result":{}}]\n'
+        + b"[]\n"
+    )
+    for seed in range(20):
+        out, noise = frame(stream, seed)
+        assert out.split(b"\n")[:-1] == [
+            rpc(1),
+            b"  " + rpc(2) + b"\r",
+            b'[{"jsonrpc":"2.0","id":3,"result":{}}]',
+            b"[]",
+        ]
+        assert noise == b"Blender 5.0 starting\n[hera] loaded\n"
+
+
+def test_stray_brace_costs_only_its_line():
+    stream = b"{ Blender: bad {\n" + rpc(1) + b"\n" + b'{"warn": "unterminated\n' + rpc(2) + b"\n"
+    for seed in range(20):
+        out, noise = frame(stream, seed)
+        assert out.splitlines() == [rpc(1), rpc(2)]
+        assert noise == b'{ Blender: bad {\n{"warn": "unterminated\n'
+
+
+def test_lines_are_never_split_between_streams():
+    noise_lines = b"{'addon': 'loaded', 'warnings': 3}\n{} trailing {\n" + rpc(2) + b" [hera] done\n"
+    stream = rpc(1) + b"\n" + noise_lines
+    for seed in range(5):
+        out, noise = frame(stream, seed)
+        assert out == rpc(1) + b"\n"
+        assert noise == noise_lines
+
+
+def test_unterminated_tail_is_noise():
+    out, noise = frame(rpc(1) + b"\n" + rpc(2))
+    assert out == rpc(1) + b"\n"
+    assert noise == rpc(2)
+
+
+PUMP = r"""
+import importlib.util, subprocess, sys
+spec = importlib.util.spec_from_file_location("stdio_filter", sys.argv[1])
+stdio_filter = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(stdio_filter)
+p = subprocess.Popen([sys.executable, "-c", sys.argv[2]], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+stdio_filter.pump_with_selector(p)
+sys.exit(p.wait())
+"""
+
+# Writes a large response before it reads anything, then counts its input.
+BIG_WRITER = r"""
+import sys
+sys.stdout.buffer.write(b'{"jsonrpc":"2.0","id":1,"result":"' + b"x" * 1000000 + b'"}\n')
+sys.stdout.buffer.flush()
+sys.stderr.write("got %d\n" % len(sys.stdin.buffer.read()))
+"""
+
+
+@pytest.mark.skipif(os.name == "nt", reason="selector pump is POSIX-only")
+def test_selector_pump_does_not_deadlock_on_full_pipes():
+    request = b'{"jsonrpc":"2.0","id":2,"method":"ping","params":"' + b"y" * 1000000 + b'"}\n'
+    proc = subprocess.Popen(
+        [sys.executable, "-c", PUMP, str(REPO_ROOT / "tools" / "stdio_filter.py"), BIG_WRITER],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        out, err = proc.communicate(request, timeout=20)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.communicate()
+        pytest.fail("selector pump deadlocked")
+    assert len(out) == 1000037
+    assert b"got %d" % len(request) in err
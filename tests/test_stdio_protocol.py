@@ -1,40 +1,76 @@
 from __future__ import annotations
 
 import json
+import os
+import select
 import subprocess
 import sys
 import threading
 import time
+import weakref
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional
+
+import pytest
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 PROXY = REPO_ROOT / "tools" / "stdio_proxy.py"
 
 
 def spawn_proxy(child_cmd):
+    # Unbuffered binary pipes: stdout is read with os.read (see read_line), so
+    # select() readiness is exact and no line hides in a Python-side buffer.
     proc = subprocess.Popen(
         [sys.executable, "-u", str(PROXY), "--"] + child_cmd,
         stdin=subprocess.PIPE,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        text=True,
-        encoding="utf-8",
-        bufsize=1,
+        bufsize=0,
     )
     return proc
 
 
+def send(proc: subprocess.Popen, obj: dict) -> None:
+    proc.stdin.write(json.dumps(obj).encode("utf-8") + b"\n")
+
+
+# Bytes read past the last newline, per proxy, kept for the next call.
+_PENDING: weakref.WeakKeyDictionary[subprocess.Popen, bytearray] = weakref.WeakKeyDictionary()
+
+
+def read_line(proc: subprocess.Popen, deadline: float) -> Optional[bytes]:
+    """
+    Next stdout line (without the newline), or None on timeout or EOF. Reads
+    64 KiB chunks; a partial line never blocks past the deadline.
+    """
+    fd = proc.stdout.fileno()
+    buf = _PENDING.setdefault(proc, bytearray())
+    while True:
+        i = buf.find(b"\n")
+        if i >= 0:
+            line = bytes(buf[:i])
+            del buf[: i + 1]
+            return line
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        # select() only handles sockets on Windows; there the read just blocks.
+        if os.name != "nt" and not select.select([fd], [], [], remaining)[0]:
+            return None
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            return None  # EOF
+        buf += chunk
+
+
 def read_json_line(proc: subprocess.Popen, timeout: float = 5.0) -> Optional[dict]:
-    start = time.time()
-    buf = ""
-    while time.time() - start < timeout:
-        if proc.stdout is None:
+    if proc.stdout is None:
+        return None
+    deadline = time.monotonic() + timeout
+    while True:
+        line = read_line(proc, deadline)
+        if line is None:
             return None
-        line = proc.stdout.readline()
-        if not line:
-            time.sleep(0.01)
-            continue
         line = line.strip()
         if not line:
             continue
@@ -42,7 +78,6 @@ def read_json_line(proc: subprocess.Popen, timeout: float = 5.0) -> Optional[dic
             return json.loads(line)
         except Exception:
             continue
-    return None
 
 
 def drain_stderr(proc: subprocess.Popen, sink: Callable[[str], None]):
@@ -50,16 +85,16 @@ def drain_stderr(proc: subprocess.Popen, sink: Callable[[str], None]):
         if proc.stderr is None:
             return
         for line in proc.stderr:
-            sink(line.rstrip("\n"))
+            sink(line.decode("utf-8", errors="replace").rstrip("\n"))
 
     t = threading.Thread(target=_pump, daemon=True)
     t.start()
     return t
 
 
-def test_ping_and_json_only():
-    # Child: emits readiness token to stderr, then echoes a ping response and noise to stdout.
-    child_code = r"""
+CHILD_SCRIPTS = {
+    # Emits readiness token to stderr, then answers ping and tools/call with noise on stdout.
+    "ping_echo": r"""
 import sys, json, time
 sys.stderr.write("HERA_READY\n"); sys.stderr.flush()
 for line in sys.stdin:
@@ -69,21 +104,68 @@ for line in sys.stdin:
     elif obj.get("method") == "tools/call":
         sys.stdout.write("NOISE\n"); sys.stdout.flush()
         sys.stdout.write(json.dumps({"jsonrpc":"2.0","id":obj.get("id"),"result":{"ok":True}})+"\n"); sys.stdout.flush()
-"""
-    proc = spawn_proxy([sys.executable, "-u", "-c", child_code])
+""",
+    # Never emits readiness and exits immediately.
+    "exit_before_ready": r"""
+import sys
+sys.exit(0)
+""",
+    # Never emits readiness; lives until its stdin closes.
+    "silent_boot": r"""
+import sys
+for _ in sys.stdin:
+    pass
+""",
+    # Emits readiness; answers tools/call with a long JSON run, then an add-on print.
+    "chatty": r"""
+import sys, json
+sys.stderr.write("HERA_READY\n"); sys.stderr.flush()
+for line in sys.stdin:
+    obj = json.loads(line)
+    for i in range(20):
+        sys.stdout.write(json.dumps({"jsonrpc":"2.0","method":"notifications/progress","params":{"n":i}})+"\n")
+    sys.stdout.write("{'addon': 'loaded', 'warnings': 3}\n")
+    sys.stdout.write(json.dumps({"jsonrpc":"2.0","id":obj.get("id"),"result":{}})+"\n")
+    sys.stdout.flush()
+""",
+    # Emits readiness, then answers tools/call.
+    "forward_tools_call": r"""
+import sys, json
+sys.stderr.write("HERA_READY\n"); sys.stderr.flush()
+for line in sys.stdin:
+    obj = json.loads(line)
+    if obj.get("method") == "tools/call":
+        sys.stdout.write(json.dumps({"jsonrpc":"2.0","id":obj.get("id"),"result":{"isError":False,"content":[{"type":"text","text":"ok"}]}})+"\n"); sys.stdout.flush()
+""",
+}
+
+
+@pytest.fixture(scope="session")
+def child_scripts(tmp_path_factory) -> Dict[str, Path]:
+    """
+    Write each child program to disk once per session.
+    """
+    root = tmp_path_factory.mktemp("children")
+    paths = {}
+    for name, code in CHILD_SCRIPTS.items():
+        path = root / f"{name}.py"
+        path.write_text(code, encoding="utf-8")
+        paths[name] = path
+    return paths
+
+
+def test_ping_and_json_only(child_scripts):
+    proc = spawn_proxy([sys.executable, "-u", str(child_scripts["ping_echo"])])
     logs = []
     drain_stderr(proc, logs.append)
 
-    assert proc.stdin is not None
-    proc.stdin.write(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "ping"}) + "\n")
-    proc.stdin.flush()
+    send(proc, {"jsonrpc": "2.0", "id": 1, "method": "ping"})
 
     resp = read_json_line(proc, timeout=5)
     assert resp and resp.get("result", {}).get("ok") is True
 
     # ensure no noise on stdout
-    proc.stdin.write(json.dumps({"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {}}) + "\n")
-    proc.stdin.flush()
+    send(proc, {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {}})
     resp2 = read_json_line(proc, timeout=5)
     assert resp2 and resp2.get("id") == 2
     # readiness token on stderr
@@ -91,41 +173,85 @@ for line in sys.stdin:
     proc.terminate()
 
 
-def test_tools_call_before_ready_gets_error_on_child_exit():
-    # Child never emits readiness and exits immediately.
-    child_code = r"""
-import sys
-sys.exit(0)
-"""
-    proc = spawn_proxy([sys.executable, "-u", "-c", child_code])
+def test_tools_call_before_ready_gets_error_on_child_exit(child_scripts):
+    proc = spawn_proxy([sys.executable, "-u", str(child_scripts["exit_before_ready"])])
     logs = []
     drain_stderr(proc, logs.append)
-    assert proc.stdin is not None
-    proc.stdin.write(json.dumps({"jsonrpc": "2.0", "id": 10, "method": "tools/call", "params": {}}) + "\n")
-    proc.stdin.flush()
+    send(proc, {"jsonrpc": "2.0", "id": 10, "method": "tools/call", "params": {}})
     resp = read_json_line(proc, timeout=5)
     assert resp is not None
     assert resp.get("result", {}).get("isError") is True
     proc.wait(timeout=5)
 
 
-def test_tools_call_after_ready_forwarded():
-    child_code = r"""
-import sys, json
-sys.stderr.write("HERA_READY\n"); sys.stderr.flush()
-for line in sys.stdin:
-    obj = json.loads(line)
-    if obj.get("method") == "tools/call":
-        sys.stdout.write(json.dumps({"jsonrpc":"2.0","id":obj.get("id"),"result":{"isError":False,"content":[{"type":"text","text":"ok"}]}})+"\n"); sys.stdout.flush()
-"""
-    proc = spawn_proxy([sys.executable, "-u", "-c", child_code])
+def test_tools_call_after_ready_forwarded(child_scripts):
+    proc = spawn_proxy([sys.executable, "-u", str(child_scripts["forward_tools_call"])])
     logs = []
     drain_stderr(proc, logs.append)
-    assert proc.stdin is not None
-    proc.stdin.write(json.dumps({"jsonrpc": "2.0", "id": 20, "method": "tools/call", "params": {}}) + "\n")
-    proc.stdin.flush()
+    send(proc, {"jsonrpc": "2.0", "id": 20, "method": "tools/call", "params": {}})
     resp = read_json_line(proc, timeout=5)
     assert resp is not None
     assert resp.get("result", {}).get("isError") is False
     assert any("HERA_READY" in l for l in logs)
     proc.terminate()
+
+
+def test_bootstrap_answers_before_ready(child_scripts):
+    proc = spawn_proxy([sys.executable, "-u", str(child_scripts["silent_boot"])])
+    drain_stderr(proc, lambda _: None)
+    send(proc, {"jsonrpc": "2.0", "id": "init-1", "method": "initialize", "params": {}})
+    send(proc, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+    init = read_json_line(proc, timeout=5)
+    tools = read_json_line(proc, timeout=5)
+    assert init["id"] == "init-1"
+    assert init["result"]["serverInfo"]["name"] == "hera-mcp-proxy"
+    assert tools["id"] == 2
+    assert any(t["name"] == "hera.health" for t in tools["result"]["tools"])
+    proc.terminate()
+
+
+def test_boot_queue_uses_top_level_id_and_method(child_scripts):
+    # params serialized before id/method must not shadow them while booting.
+    proc = spawn_proxy([sys.executable, "-u", str(child_scripts["exit_before_ready"])])
+    drain_stderr(proc, lambda _: None)
+    proc.stdin.write(
+        b'{"method":"tools/call","params":{"arguments":{"id":"Cube","method":"initialize"}},"jsonrpc":"2.0","id":5}\n'
+    )
+    resp = read_json_line(proc, timeout=5)
+    assert resp["id"] == 5
+    assert resp["result"]["isError"] is True
+    proc.wait(timeout=5)
+
+
+def test_python_repr_noise_never_reaches_stdout(child_scripts):
+    proc = spawn_proxy([sys.executable, "-u", str(child_scripts["chatty"])])
+    logs = []
+    pump = drain_stderr(proc, logs.append)
+    send(proc, {"jsonrpc": "2.0", "id": 30, "method": "tools/call", "params": {}})
+    seen = []
+    while True:
+        line = read_json_line(proc, timeout=5)
+        assert line is not None
+        seen.append(line)
+        if line.get("id") == 30:
+            break
+    assert len(seen) == 21
+    proc.terminate()
+    proc.wait(timeout=5)
+    pump.join(timeout=5)
+    # Each child stdout line goes to exactly one side; this one must be stderr.
+    assert "[child-stdout] {'addon': 'loaded', 'warnings': 3}" in logs
+
+
+def test_malformed_requests_before_ready_do_not_kill_proxy(child_scripts):
+    proc = spawn_proxy([sys.executable, "-u", str(child_scripts["silent_boot"])])
+    drain_stderr(proc, lambda _: None)
+    proc.stdin.write(b'[{"jsonrpc":"2.0","id":1,"method":"ping"}]\n')
+    proc.stdin.write(b'{"jsonrpc":"2.0","id":2,"method":["x"]}\n')
+    proc.stdin.write(b'{"jsonrpc":"2.0","id":3,"method":{"a":1}}\n')
+    proc.stdin.write(b'"just a string"\n')
+    send(proc, {"jsonrpc": "2.0", "id": 4, "method": "ping"})
+    resp = read_json_line(proc, timeout=5)
+    assert resp is not None and resp["id"] == 4
+    assert proc.poll() is None
+    proc.terminate()
@@ -0,0 +1,71 @@
+"""
+Shared I/O helpers for the MCP smoke tests (mcp_smoke_test*.py).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import select
+import subprocess
+import time
+from typing import Any, Dict, Optional
+
+try:  # optional C codec; stdlib json is the fallback
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+loads = orjson.loads if orjson is not None else json.loads
+
+
+def frame(obj: Any) -> bytes:
+    """
+    One compact, newline-terminated request, encoded in a single pass.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def popen_extra() -> Dict[str, Any]:
+    """
+    Spawn options: on Windows, no console window and a separate process group
+    for the server; on POSIX, no inherited descriptors beyond the pipes.
+    """
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"close_fds": True}
+
+
+# Bytes read past the last newline, per stdout fd, kept for the next call.
+_PENDING: Dict[int, bytearray] = {}
+
+
+def read_line(p: subprocess.Popen, deadline: float) -> Optional[bytes]:
+    """
+    Next newline-terminated line from p.stdout in 64 KiB reads, or None on
+    timeout. Raises EOFError once the process has closed stdout.
+    """
+    assert p.stdout is not None
+    fd = p.stdout.fileno()
+    buf = _PENDING.setdefault(fd, bytearray())
+    while True:
+        i = buf.find(b"\n")
+        if i >= 0:
+            line = bytes(buf[: i + 1])
+            del buf[: i + 1]
+            return line
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        # select() only accepts sockets on Windows; there the read just blocks.
+        if os.name != "nt":
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                return None
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            raise EOFError("Server closed stdout before responding.")
+        buf += chunk
@@ -5,7 +5,9 @@ import os
 import subprocess
 import sys
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List
+
+from mcp_smoke_common import frame, loads, popen_extra, read_line
 
 
 def eprint(*args: object) -> None:
@@ -21,23 +23,14 @@ def read_jsonrpc_line(p: subprocess.Popen, timeout_s: float = 10.0) -> Dict[str,
     Read lines from p.stdout until we find a valid JSON-RPC object.
     Ignore empty lines and non-JSON lines (some hosts/proxies can leak noise).
     """
-    assert p.stdout is not None
-    deadline = time.time() + timeout_s
-    buf = b""
-
-    while time.time() < deadline:
-        chunk = p.stdout.read(1)
-        if not chunk:
-            # process may not have produced output yet; small sleep prevents busy loop
-            time.sleep(0.01)
-            continue
+    deadline = time.monotonic() + timeout_s
 
-        buf += chunk
-        if chunk != b"\n":
-            continue
+    while True:
+        raw = read_line(p, deadline)
+        if raw is None:
+            break
 
-        line = buf.decode("utf-8", errors="replace").strip()
-        buf = b""
+        line = raw.decode("utf-8", errors="replace").strip()
 
         if not line:
             continue
@@ -48,7 +41,7 @@ def read_jsonrpc_line(p: subprocess.Popen, timeout_s: float = 10.0) -> Dict[str,
             s = s[s.find("{") :]
 
         try:
-            obj = json.loads(s)
+            obj = loads(s)
         except Exception:
             # ignore noise; keep going
             eprint("[smoke] ignored non-JSON line:", line[:200])
@@ -65,12 +58,33 @@ def read_jsonrpc_line(p: subprocess.Popen, timeout_s: float = 10.0) -> Dict[str,
 
 def rpc(p: subprocess.Popen, req: Dict[str, Any], timeout_s: float = 10.0) -> Dict[str, Any]:
     assert p.stdin is not None
-    msg = (json.dumps(req, ensure_ascii=False) + "\n").encode("utf-8")
-    p.stdin.write(msg)
-    p.stdin.flush()
+    # stdin is unbuffered (bufsize=0): one write() is one syscall, no flush needed.
+    p.stdin.write(frame(req))
     return read_jsonrpc_line(p, timeout_s=timeout_s)
 
 
+def rpc_many(p: subprocess.Popen, reqs: List[Dict[str, Any]], timeout_s: float = 10.0) -> Dict[Any, Dict[str, Any]]:
+    """
+    Pipeline independent requests in one write, then collect the responses by
+    id (in whatever order they arrive) within a shared deadline.
+    """
+    assert p.stdin is not None
+    p.stdin.write(b"".join(frame(req) for req in reqs))
+
+    pending = {req["id"] for req in reqs}
+    responses: Dict[Any, Dict[str, Any]] = {}
+    deadline = time.monotonic() + timeout_s
+    while pending:
+        obj = read_jsonrpc_line(p, timeout_s=deadline - time.monotonic())
+        rid = obj.get("id")
+        if rid in pending:
+            pending.discard(rid)
+            responses[rid] = obj
+        else:
+            eprint("[smoke] ignored response with unexpected id:", rid)
+    return responses
+
+
 def main() -> int:
     repo = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     launcher = os.path.join(repo, "tools", "hera-stdio.ps1")
@@ -85,6 +99,7 @@ def main() -> int:
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         bufsize=0,
+        **popen_extra(),
     )
 
     # pump stderr so buffers don't block
@@ -116,27 +131,24 @@ def main() -> int:
     )
     eprint("[smoke] initialize ok")
 
-    # tools/list
-    r2 = rpc(p, {"jsonrpc": "2.0", "id": 2, "method": "tools/list", "params": {}}, timeout_s=10.0)
-    eprint("[smoke] tools/list ok")
-
-    # optional Claude calls (we accept stubs)
-    _ = rpc(p, {"jsonrpc": "2.0", "id": 20, "method": "resources/list", "params": {}}, timeout_s=10.0)
-    eprint("[smoke] resources/list ok")
-    _ = rpc(p, {"jsonrpc": "2.0", "id": 21, "method": "prompts/list", "params": {}}, timeout_s=10.0)
-    eprint("[smoke] prompts/list ok")
-
-    # tools/call health
-    r3 = rpc(
-        p,
-        {"jsonrpc": "2.0", "id": 3, "method": "tools/call", "params": {"name": "hera.health", "arguments": {}}},
-        timeout_s=10.0,
-    )
-    eprint("[smoke] tools/call health ok")
-
-    # ping
-    r4 = rpc(p, {"jsonrpc": "2.0", "id": 4, "method": "ping", "params": {}}, timeout_s=10.0)
-    eprint("[smoke] ping ok")
+    # Everything after initialize is independent: send it back-to-back and
+    # match responses by id instead of waiting one round-trip per request.
+    # resources/list and prompts/list are optional Claude calls (we accept stubs).
+    steps = [
+        (2, "tools/list", {"jsonrpc": "2.0", "id": 2, "method": "tools/list", "params": {}}),
+        (20, "resources/list", {"jsonrpc": "2.0", "id": 20, "method": "resources/list", "params": {}}),
+        (21, "prompts/list", {"jsonrpc": "2.0", "id": 21, "method": "prompts/list", "params": {}}),
+        (
+            3,
+            "tools/call health",
+            {"jsonrpc": "2.0", "id": 3, "method": "tools/call", "params": {"name": "hera.health", "arguments": {}}},
+        ),
+        (4, "ping", {"jsonrpc": "2.0", "id": 4, "method": "ping", "params": {}}),
+    ]
+    responses = rpc_many(p, [req for _, _, req in steps], timeout_s=20.0)
+    for _, label, _ in steps:
+        eprint(f"[smoke] {label} ok")
+    r2, r3, r4 = responses[2], responses[3], responses[4]
 
     # Print the JSON-RPC results to stdout (optional visibility)
     # (This stays JSON-only lines.)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import os
+import shutil
 import subprocess
 import sys
 import time
@@ -9,55 +10,54 @@ import threading
 from pathlib import Path
 from typing import Optional
 
+from mcp_smoke_common import frame, loads, popen_extra, read_line
+
 
 def j(obj) -> str:
     return json.dumps(obj, ensure_ascii=False)
 
 
+# Health probe with only the id varying; filled with % instead of re-encoding.
+HEALTH_CALL = b'{"jsonrpc":"2.0","id":%d,"method":"tools/call","params":{"name":"hera.health","arguments":{}}}\n'
+
+
+# (first, last) bytes of a line that can hold a JSON object or batch array.
+JSON_BOUNDS = {(0x7B, 0x7D), (0x5B, 0x5D)}
+
+
 def is_jsonrpc(obj) -> bool:
     return isinstance(obj, dict) and ("jsonrpc" in obj)
 
 
-def read_one_jsonrpc_line(p: subprocess.Popen, timeout_s: float = 8.0) -> Optional[dict]:
+def read_one_jsonrpc_line(p: subprocess.Popen, timeout_s: float = 8.0) -> Optional[dict | list]:
     """
-    Read stdout until we get a valid JSON-RPC dict, skipping blank/noise lines.
-    Works with both text noise and pure JSON streams.
+    Read stdout until we get a valid JSON-RPC message (object or batch array),
+    skipping blank/noise lines. Works with both text noise and pure JSON streams.
     """
-    t0 = time.time()
-    buf = b""
-    while time.time() - t0 < timeout_s:
-        ch = p.stdout.read(1)  # type: ignore[attr-defined]
-        if not ch:
-            # process may still be alive; give it a moment
-            if p.poll() is not None:
-                return None
-            time.sleep(0.01)
-            continue
-
-        buf += ch
-        if ch != b"\n":
-            continue
-
-        line = buf.decode("utf-8", errors="replace").strip()
-        buf = b""
+    deadline = time.monotonic() + timeout_s
+    while True:
+        try:
+            raw = read_line(p, deadline)
+        except EOFError:
+            return None
+        if raw is None:
+            return None
 
-        if not line:
-            continue
+        line = raw.strip()
 
-        # Some hosts/loggers can accidentally prepend noise; ignore non-JSON lines.
-        if not (line.startswith("{") and line.endswith("}")):
+        # Some hosts/loggers can accidentally prepend noise; ignore non-JSON
+        # lines by their first/last byte, without decoding them.
+        if not line or (line[0], line[-1]) not in JSON_BOUNDS:
             continue
 
         try:
-            obj = json.loads(line)
+            obj = loads(line)
         except Exception:
             continue
 
-        if is_jsonrpc(obj):
+        if is_jsonrpc(obj) or (isinstance(obj, list) and obj and all(map(is_jsonrpc, obj))):
             return obj
 
-    return None
-
 
 def main() -> int:
     repo_root = Path(__file__).resolve().parents[1]
@@ -66,13 +66,12 @@ def main() -> int:
         print(f"[smoke-claude] launcher not found: {launcher}", file=sys.stderr)
         return 1
 
-    # Always use pwsh if available (more predictable than legacy powershell)
-    shell = "pwsh"
-    try:
-        subprocess.check_call([shell, "-NoLogo", "-NoProfile", "-Command", "exit 0"],
-                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    except Exception:
-        shell = "powershell"
+    # Always use pwsh if available (more predictable than legacy powershell).
+    # A PATH lookup, not a probe process: no extra shell start before the test.
+    shell = shutil.which("pwsh") or shutil.which("powershell")
+    if not shell:
+        print("[smoke-claude] neither pwsh nor powershell found on PATH", file=sys.stderr)
+        return 1
 
     cmd = [shell, "-NoLogo", "-NoProfile", "-ExecutionPolicy", "Bypass", "-File", str(launcher)]
     print("[smoke-claude] launching:", " ".join(cmd), file=sys.stderr)
@@ -84,27 +83,61 @@ def main() -> int:
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         bufsize=0,
+        **popen_extra(),
         text=False,
     )
 
     # Pump stderr so buffers never block
     def pump_err():
+        # Forward raw bytes, one write per chunk: no decode/print per line, and
+        # no byte-at-a-time readline on the unbuffered pipe.
         assert p.stderr is not None
-        for raw in iter(p.stderr.readline, b""):
-            s = raw.decode("utf-8", errors="replace").rstrip("\r\n")
-            if s:
-                print("[server-stderr] " + s, file=sys.stderr)
+        fd = p.stderr.fileno()
+        out = sys.stderr.buffer
+        pending = bytearray()
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                break
+            pending += chunk
+            end = pending.rfind(b"\n")
+            if end < 0:
+                continue
+            lines = [line.rstrip(b"\r") for line in pending[:end].split(b"\n")]
+            del pending[: end + 1]
+            out.write(b"".join(b"[server-stderr] " + line + b"\n" for line in lines if line))
+            out.flush()
+        if pending.rstrip(b"\r"):
+            out.write(b"[server-stderr] " + bytes(pending.rstrip(b"\r")) + b"\n")
+            out.flush()
 
     threading.Thread(target=pump_err, daemon=True).start()
 
-    def rpc(req: dict, timeout_s: float = 10.0) -> dict:
+    def rpc_nothrow(req: dict | bytes, timeout_s: float = 10.0, rid: object = None) -> Optional[dict]:
+        """
+        Send one request and return the response whose id matches (rid, or
+        req["id"] for a dict), unwrapped from a batch if needed. Other
+        messages, such as a late reply to an earlier attempt, are skipped.
+        None on timeout or exit instead of raising, for retry loops where no
+        response is the expected case.
+        """
         assert p.stdin is not None
         assert p.stdout is not None
-        msg = (j(req) + "\n").encode("utf-8")
-        p.stdin.write(msg)
-        p.stdin.flush()
+        if rid is None and isinstance(req, dict):
+            rid = req.get("id")
+        # stdin is unbuffered (bufsize=0): one write() is one syscall, no flush needed.
+        p.stdin.write(req if isinstance(req, bytes) else frame(req))
+        deadline = time.monotonic() + timeout_s
+        while True:
+            obj = read_one_jsonrpc_line(p, timeout_s=max(0.0, deadline - time.monotonic()))
+            if obj is None:
+                return None
+            for msg in obj if isinstance(obj, list) else (obj,):
+                if msg.get("id") == rid:
+                    return msg
 
-        obj = read_one_jsonrpc_line(p, timeout_s=timeout_s)
+    def rpc(req: dict | bytes, timeout_s: float = 10.0, rid: object = None) -> dict:
+        obj = rpc_nothrow(req, timeout_s=timeout_s, rid=rid)
         if obj is None:
             raise RuntimeError("No JSON-RPC response (timeout or process exited).")
         return obj
@@ -130,20 +163,18 @@ def main() -> int:
         print("[smoke-claude] ping =", j(r3), file=sys.stderr)
 
         # Retry tools/call health until success (queue may delay responses during boot)
+        # Each attempt waits up to 2 s for its reply; the pause between attempts
+        # backs off from 25 ms to 0.5 s, so a server that is already up answers
+        # on the first tries without paying a fixed 250 ms each. Worst case is
+        # 20 x 2 s + ~8 s of pauses, about 48 s.
         success = False
+        attempt_timeout = 2.0
+        delay = 0.025
         for attempt in range(1, 21):
-            try:
-                r4 = rpc(
-                    {
-                        "jsonrpc": "2.0",
-                        "id": 100 + attempt,
-                        "method": "tools/call",
-                        "params": {"name": "hera.health", "arguments": {}},
-                    },
-                    timeout_s=2.0,
-                )
-            except Exception as exc:
-                time.sleep(0.25)
+            r4 = rpc_nothrow(HEALTH_CALL % (100 + attempt), rid=100 + attempt, timeout_s=attempt_timeout)
+            if r4 is None:
+                time.sleep(delay)
+                delay = min(0.5, delay * 1.6)
                 continue
             result = r4.get("result", {})
             is_error = result.get("isError")
@@ -153,14 +184,17 @@ def main() -> int:
                 if content and isinstance(content[0], dict):
                     text = content[0].get("text", "")
                     try:
-                        env = json.loads(text)
+                        # Cheap substring prefilter: only an envelope that can
+                        # be a success is parsed a second time.
+                        env = loads(text) if '"success"' in text else {}
                         if env.get("status") == "success":
                             success = True
                             print("[smoke-claude] tools/call health =", j(r4), file=sys.stderr)
                             break
                     except Exception:
                         pass
-            time.sleep(0.25)
+            time.sleep(delay)
+            delay = min(0.5, delay * 1.6)
 
         if not success:
             raise RuntimeError("tools/call health did not succeed after retries.")
@@ -4,17 +4,225 @@
 
 from __future__ import annotations
 
+import json
 import os
+import selectors
 import subprocess
 import sys
 import threading
 from pathlib import Path
+from typing import List, Tuple
 
 
 def eprint(*a):
     print(*a, file=sys.stderr, flush=True)
 
 
+def is_json_line(line: bytes) -> bool:
+    """
+    True when the raw line holds one JSON value: the first non-blank byte is
+    ``{``, or ``[`` followed by ``{`` or ``]`` (a JSON-RPC batch, so log
+    lines such as ``[hera] ...`` never qualify), and ``json.loads`` accepts
+    the line. Noise lines are rejected on their first bytes and never decoded.
+    """
+    s = line.lstrip()
+    if not (s[:1] == b"{" or s[:1] == b"[" and s[1:].lstrip()[:1] in (b"{", b"]")):
+        return False
+    try:
+        json.loads(line)
+    except ValueError:
+        # Brace-led but not JSON, e.g. a Python dict repr.
+        return False
+    return True
+
+
+class LineRouter:
+    """
+    Split a raw stdout stream into whole lines and route each one entirely to
+    stdout (JSON) or stderr (noise); a line is never split between the two.
+    """
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+
+    def feed(self, chunk: bytes) -> List[Tuple[bool, bytes]]:
+        """
+        Consume one chunk; return the (is_json, line) pairs now complete.
+        """
+        buf = self._buf
+        buf += chunk
+        end = buf.rfind(b"\n")
+        if end < 0:
+            return []
+        block = bytes(buf[: end + 1])
+        del buf[: end + 1]
+        # Split on "\n" only; a stray "\r" stays inside its line.
+        return [(is_json_line(line), line + b"\n") for line in block[:-1].split(b"\n")]
+
+    def flush(self) -> bytes:
+        """
+        Return the unterminated tail left at EOF.
+        """
+        rest = bytes(self._buf)
+        self._buf.clear()
+        return rest
+
+
+def forward_stdout(router: LineRouter, chunk: bytes) -> None:
+    for is_json, line in router.feed(chunk):
+        (sys.stdout.buffer if is_json else sys.stderr.buffer).write(line)
+    sys.stdout.buffer.flush()
+    sys.stderr.buffer.flush()
+
+
+def finish_stdout(router: LineRouter) -> None:
+    rest = router.flush()
+    if rest:
+        sys.stderr.buffer.write(rest)
+        sys.stderr.buffer.flush()
+
+
+def pump_with_selector(p: subprocess.Popen) -> None:
+    """
+    Single-threaded pump (POSIX): one selector over host stdin and the child's
+    stdout/stderr, 64 KiB reads from whichever is ready. Returns once the
+    child has closed both of its output pipes.
+
+    The child's stdin is non-blocking: a chunk the pipe cannot take at once is
+    finished when the selector reports it writable, and host stdin is not read
+    again until then. A blocking write here would stop the loop draining the
+    child's stdout, and with both pipes full neither side could progress.
+    """
+    router = LineRouter()
+    stdin_fd = sys.stdin.fileno()
+    in_fd = p.stdin.fileno()
+    out_fd = p.stdout.fileno()
+    err_fd = p.stderr.fileno()
+    os.set_blocking(in_fd, False)
+    pending = bytearray()
+    reading_host = True  # host stdin registered; paused while pending
+    host_eof = False
+    write_armed = False
+
+    sel = selectors.DefaultSelector()
+    sel.register(stdin_fd, selectors.EVENT_READ)
+    sel.register(out_fd, selectors.EVENT_READ)
+    sel.register(err_fd, selectors.EVENT_READ)
+    outputs = 2
+
+    def drain_to_child() -> None:
+        nonlocal reading_host, host_eof, write_armed
+        try:
+            while pending:
+                del pending[: os.write(in_fd, pending)]
+        except BlockingIOError:
+            pass
+        except OSError:
+            # Child stopped reading: drop its input and stop reading the host.
+            pending.clear()
+            host_eof = True
+        want_host = not pending and not host_eof
+        if want_host != reading_host:
+            if want_host:
+                sel.register(stdin_fd, selectors.EVENT_READ)
+            else:
+                sel.unregister(stdin_fd)
+            reading_host = want_host
+        if bool(pending) != write_armed:
+            if pending:
+                sel.register(in_fd, selectors.EVENT_WRITE)
+            else:
+                sel.unregister(in_fd)
+            write_armed = bool(pending)
+        if host_eof and not pending:
+            try:
+                p.stdin.close()
+            except Exception:
+                pass
+
+    try:
+        while outputs:
+            for key, _ in sel.select():
+                fd = key.fd
+                if fd == in_fd:
+                    drain_to_child()
+                    continue
+                chunk = os.read(fd, 65536)
+                if fd == stdin_fd:
+                    if chunk:
+                        pending += chunk
+                    else:
+                        host_eof = True
+                    drain_to_child()
+                elif not chunk:
+                    sel.unregister(fd)
+                    outputs -= 1
+                    if fd == out_fd:
+                        finish_stdout(router)
+                elif fd == out_fd:
+                    forward_stdout(router, chunk)
+                else:
+                    sys.stderr.buffer.write(chunk)
+                    sys.stderr.buffer.flush()
+    except Exception as exc:
+        eprint("[hera-stdio-filter] pump error:", repr(exc))
+    finally:
+        sel.close()
+
+
+def start_pump_threads(p: subprocess.Popen) -> threading.Event:
+    """
+    Thread-per-pipe pump for Windows; returns the event that stops it.
+    """
+    stop = threading.Event()
+
+    def pump_stdin():
+        fd = sys.stdin.fileno()
+        try:
+            while not stop.is_set():
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                p.stdin.write(chunk)
+                p.stdin.flush()
+        except Exception as exc:
+            eprint("[hera-stdio-filter] stdin pump error:", repr(exc))
+        finally:
+            try:
+                p.stdin.close()
+            except Exception:
+                pass
+
+    def pump_stderr():
+        fd = p.stderr.fileno()
+        try:
+            while not stop.is_set():
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                sys.stderr.buffer.write(chunk)
+                sys.stderr.buffer.flush()
+        except Exception as exc:
+            eprint("[hera-stdio-filter] stderr pump error:", repr(exc))
+
+    def pump_stdout_filtered():
+        router = LineRouter()
+        fd = p.stdout.fileno()
+        try:
+            while not stop.is_set():
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                forward_stdout(router, chunk)
+            finish_stdout(router)
+        except Exception as exc:
+            eprint("[hera-stdio-filter] stdout pump error:", repr(exc))
+
+    for target in (pump_stdin, pump_stderr, pump_stdout_filtered):
+        threading.Thread(target=target, daemon=True).start()
+    return stop
+
+
 def main() -> int:
     eprint("[hera-stdio-filter] LEGACY: use hera-stdio.ps1 (stdio_proxy.py) instead.")
 
@@ -43,68 +251,25 @@ def main() -> int:
     cmd = [blender_exe, "-b", "--factory-startup", "--python", str(run_script)]
     eprint("[hera-stdio-filter] launching:", " ".join(f'"{x}"' if " " in x else x for x in cmd))
 
+    # Binary pipes. All reads use os.read on the raw fds, so the readers'
+    # buffers stay empty; the buffered stdin writer keeps writes whole.
     p = subprocess.Popen(
         cmd,
         stdin=subprocess.PIPE,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        bufsize=1,
-        text=True,
-        universal_newlines=True,
     )
 
     assert p.stdin and p.stdout and p.stderr
-    stop = threading.Event()
-
-    def pump_stdin():
-        try:
-            for line in sys.stdin:
-                if stop.is_set():
-                    break
-                p.stdin.write(line)
-                p.stdin.flush()
-        except Exception as exc:
-            eprint("[hera-stdio-filter] stdin pump error:", repr(exc))
-        finally:
-            try:
-                p.stdin.close()
-            except Exception:
-                pass
-
-    def pump_stderr():
-        try:
-            for line in p.stderr:
-                if stop.is_set():
-                    break
-                sys.stderr.write(line)
-                sys.stderr.flush()
-        except Exception as exc:
-            eprint("[hera-stdio-filter] stderr pump error:", repr(exc))
-
-    def pump_stdout_filtered():
-        try:
-            for line in p.stdout:
-                if stop.is_set():
-                    break
-                s = line.lstrip()
-                if s.startswith("{") or s.startswith("["):
-                    sys.stdout.write(line)
-                    sys.stdout.flush()
-                else:
-                    sys.stderr.write(line)
-                    sys.stderr.flush()
-        except Exception as exc:
-            eprint("[hera-stdio-filter] stdout pump error:", repr(exc))
-
-    t_in = threading.Thread(target=pump_stdin, daemon=True)
-    t_err = threading.Thread(target=pump_stderr, daemon=True)
-    t_out = threading.Thread(target=pump_stdout_filtered, daemon=True)
-    t_in.start()
-    t_err.start()
-    t_out.start()
+    if os.name == "nt":
+        # Windows selectors only accept sockets, so pipes keep one thread each.
+        stop = start_pump_threads(p)
+        rc = p.wait()
+        stop.set()
+    else:
+        pump_with_selector(p)
+        rc = p.wait()
 
-    rc = p.wait()
-    stop.set()
     eprint(f"[hera-stdio-filter] Blender exited (code={rc})")
     return int(rc)
 
@@ -6,14 +6,21 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
+import selectors
 import subprocess
 import sys
 import threading
-from typing import Any, Dict, List, Optional, Tuple
+from collections import deque
+from types import MappingProxyType
+from typing import Any, Callable, Deque, Dict, Iterator, List, Mapping, Optional, Tuple
 
 
 CAPABILITIES = {"tools": {}, "resources": {}, "prompts": {}}
 READY_TOKEN = "HERA_READY"
+READY_MARK = READY_TOKEN.encode("ascii")
+PREFIX_STDOUT = b"[child-stdout] "
+PREFIX_STDERR = b"[child-stderr] "
 
 TOOLS_LIST = [
     {
@@ -123,42 +130,153 @@ def log_err(msg: str) -> None:
     sys.stderr.flush()
 
 
-def looks_like_jsonrpc(text: str) -> bool:
-    stripped = text.lstrip()
-    if not stripped.startswith("{"):
+def write_stderr(chunks: List[bytes]) -> None:
+    """
+    Relay already-framed child output lines to our stderr in one write,
+    as bytes: no decode/re-encode round trip per line.
+    """
+    err = sys.stderr.buffer
+    err.write(b"".join(chunks))
+    err.flush()
+
+
+# Compact MCP frames open with one of these keys; checked in one C call.
+_JSONRPC_HEADS = (b'{"jsonrpc"', b'{"id"', b'{"method"', b'{"result"', b'{ "jsonrpc"')
+
+
+def looks_like_jsonrpc(raw: bytes) -> bool:
+    stripped = raw.lstrip()
+    if stripped.startswith(_JSONRPC_HEADS):
+        return True
+    if not stripped.startswith(b"{"):
         return False
-    markers = ('"jsonrpc"', '"method"', '"result"', '"id"')
-    return any(m in stripped for m in markers)
+    # Rare path: other key order or spacing.
+    return (
+        b'"jsonrpc"' in stripped
+        or b'"method"' in stripped
+        or b'"result"' in stripped
+        or b'"id"' in stripped
+    )
+
+
+class LineSplitter:
+    """
+    Incremental newline framing over raw chunks; the partial tail stays in a
+    bytearray that is trimmed in place.
+    """
 
+    def __init__(self) -> None:
+        self.buf = bytearray()
 
-def bootstrap_response(req: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    method = req.get("method")
-    rid = req.get("id")
-    if method == "notifications/initialized":
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """
+        Lines (without the newline) completed by chunk.
+        """
+        buf = self.buf
+        buf += chunk
+        end = buf.rfind(b"\n")
+        if end < 0:
+            return []
+        lines = bytes(buf[:end]).split(b"\n")
+        del buf[: end + 1]
+        return lines
+
+    def flush(self) -> List[bytes]:
+        """
+        The unterminated tail at EOF, if any.
+        """
+        rest = bytes(self.buf)
+        self.buf.clear()
+        return [rest] if rest else []
+
+
+def read_lines(fd: int) -> Iterator[List[bytes]]:
+    """
+    Blocking variant: read fd in 64 KiB chunks and yield, per chunk, the lines
+    it completed. A trailing unterminated line is yielded at EOF.
+    """
+    splitter = LineSplitter()
+    while True:
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            break
+        lines = splitter.feed(chunk)
+        if lines:
+            yield lines
+    rest = splitter.flush()
+    if rest:
+        yield rest
+
+
+def may_end_session(line: bytes) -> bool:
+    """
+    Cheap pre-check: only a line mentioning shutdown/exit can be one of the
+    requests the proxy must see parsed once the child is ready.
+    """
+    return b"shutdown" in line or b"exit" in line
+
+
+# Results the proxy answers itself while the child boots. They never depend
+# on the request, so each body is serialized once and only the id is spliced
+# in per response.
+BOOTSTRAP_RESULTS: Dict[str, Dict[str, Any]] = {
+    "initialize": {
+        "protocolVersion": "2024-11-05",
+        "serverInfo": {"name": "hera-mcp-proxy", "version": "0.1.0"},
+        "capabilities": CAPABILITIES,
+    },
+    "ping": {"ok": True},
+    "tools/list": {"tools": TOOLS_LIST},
+    "resources/list": {"resources": []},
+    "prompts/list": {"prompts": []},
+    "shutdown": {"ok": True},
+    "exit": {},
+}
+# Read-only: this is the table actually served.
+BOOTSTRAP_BODIES: Mapping[str, bytes] = MappingProxyType({
+    method: json.dumps(result, separators=(",", ":")).encode("utf-8")
+    for method, result in BOOTSTRAP_RESULTS.items()
+})
+
+# Clients number requests 1..N; the boot burst reuses the same few ids.
+_ID_CACHE_MAX = 1024
+_ID_CACHE: Dict[int, bytes] = {}
+
+
+def id_bytes(rid: Any) -> bytes:
+    """
+    JSON encoding of a request id, cached for plain ints.
+    """
+    if type(rid) is int:  # not bool: json spells those true/false
+        cached = _ID_CACHE.get(rid)
+        if cached is None:
+            cached = str(rid).encode("ascii")
+            if len(_ID_CACHE) < _ID_CACHE_MAX:
+                _ID_CACHE[rid] = cached
+        return cached
+    if rid is None:
+        return b"null"
+    return json.dumps(rid).encode("utf-8")
+
+
+def bootstrap_response(method: Any, rid: Any) -> Optional[bytes]:
+    """
+    Newline-terminated bootstrap response for method, or None if the proxy
+    cannot answer it before the child is ready.
+    """
+    if not isinstance(method, str):
         return None
-    if method == "initialize":
-        return {
-            "jsonrpc": "2.0",
-            "id": rid,
-            "result": {
-                "protocolVersion": "2024-11-05",
-                "serverInfo": {"name": "hera-mcp-proxy", "version": "0.1.0"},
-                "capabilities": CAPABILITIES,
-            },
-        }
-    if method == "ping":
-        return {"jsonrpc": "2.0", "id": rid, "result": {"ok": True}}
-    if method == "tools/list":
-        return {"jsonrpc": "2.0", "id": rid, "result": {"tools": TOOLS_LIST}}
-    if method == "resources/list":
-        return {"jsonrpc": "2.0", "id": rid, "result": {"resources": []}}
-    if method == "prompts/list":
-        return {"jsonrpc": "2.0", "id": rid, "result": {"prompts": []}}
-    if method == "shutdown":
-        return {"jsonrpc": "2.0", "id": rid, "result": {"ok": True}}
-    if method == "exit":
-        return {"jsonrpc": "2.0", "id": rid, "result": {}}
-    return None
+    body = BOOTSTRAP_BODIES.get(method)
+    if body is None:
+        return None
+    return b'{"jsonrpc":"2.0","id":' + id_bytes(rid) + b',"result":' + body + b"}\n"
+
+
+# Everything after the id in the error sent for requests still queued when
+# the child exits before becoming ready.
+BACKEND_EXITED_TAIL = (
+    b',"result":{"isError":true,"content":[{"type":"text","text":"Backend exited before ready"}]}}\n'
+)
 
 
 class Proxy:
@@ -168,10 +286,18 @@ class Proxy:
         self.ready = threading.Event()
         self.shutdown = threading.Event()
         self.exit_code: Optional[int] = None
-        self.queue: List[Tuple[Any, str]] = []
-        self.queue_lock = threading.Lock()
+        # (raw JSON id or None, request line) held until the child is ready.
+        # queue_lock covers the ready flag too: a request is either queued
+        # before the ready flush or forwarded after it, never stranded.
         self.queue_max = 25
-        self.flushed_on_ready = False
+        self.queue: Deque[Tuple[Optional[bytes], bytes]] = deque()
+        self.queue_lock = threading.Lock()
+        # Set while run_selector owns the pipes; child stdin is then non-blocking.
+        self.selector: Optional[selectors.BaseSelector] = None
+        self.child_pending = bytearray()
+        self.child_write_armed = False
+        # Bootstrap replies for the current batch of host lines, sent in one write.
+        self.replies: List[bytes] = []
 
     def start_child(self) -> None:
         self.child = subprocess.Popen(
@@ -179,111 +305,226 @@ class Proxy:
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            bufsize=1,
-            text=True,
-            encoding="utf-8",
         )
 
-    def enqueue_request(self, req_id: Any, raw_line: str) -> None:
+    def enqueue_request(self, req_id: Optional[bytes], raw_line: bytes) -> bool:
+        """
+        Queue a request for the child; False if it became ready meanwhile
+        and the caller should forward the request instead.
+        """
         with self.queue_lock:
+            if self.ready.is_set():
+                return False
             if len(self.queue) >= self.queue_max:
-                dropped = self.queue.pop(0)
-                log_err(f"[proxy] queue full; dropping oldest id={dropped[0]}")
+                dropped = self.queue.popleft()[0]
+                log_err(f"[proxy] queue full; dropping oldest id={dropped.decode() if dropped else None}")
             self.queue.append((req_id, raw_line))
+            return True
 
-    def flush_queued(self) -> None:
-        if not self.child or not self.child.stdin:
-            return
+    def drain_queue(self) -> List[Tuple[Optional[bytes], bytes]]:
         with self.queue_lock:
-            if not self.queue:
+            items = list(self.queue)
+            self.queue.clear()
+        return items
+
+    def mark_ready(self) -> None:
+        # Flag and flush under one lock hold, so no request lands in the
+        # queue after it was flushed and none overtakes the queued ones.
+        with self.queue_lock:
+            if self.ready.is_set():
                 return
+            self.ready.set()
             items = list(self.queue)
             self.queue.clear()
-            self.flushed_on_ready = True
-        for _, line in items:
+            if items and not self.write_child(b"".join(line + b"\n" for _, line in items)):
+                log_err("[proxy] failed to flush queued requests")
+
+    def write_child(self, data: bytes, flush: bool = True) -> bool:
+        """
+        Send bytes to the child's stdin; with flush=False they are only
+        buffered until the next flush_child. In selector mode the fd is
+        non-blocking: whatever does not fit in the pipe is kept and written
+        when the selector reports it writable, so the loop never stalls.
+        """
+        if self.selector is None:
             try:
-                self.child.stdin.write(line + "\n")
-                self.child.stdin.flush()
+                self.child.stdin.write(data)
             except Exception as exc:
-                log_err(f"[proxy] failed to flush queued request: {exc}")
+                log_err(f"[proxy] failed to write to child: {exc}")
+                return False
+            return self.flush_child() if flush else True
+        self.child_pending += data
+        return self.drain_child_writes() if flush else True
+
+    def flush_child(self) -> bool:
+        if self.selector is not None:
+            return self.drain_child_writes()
+        try:
+            self.child.stdin.flush()
+        except Exception as exc:
+            log_err(f"[proxy] failed to write to child: {exc}")
+            return False
+        return True
+
+    def drain_child_writes(self) -> bool:
+        fd = self.child.stdin.fileno()
+        pending = self.child_pending
+        ok = True
+        while pending:
+            try:
+                n = os.write(fd, pending)
+            except BlockingIOError:
+                break
+            except OSError as exc:
+                log_err(f"[proxy] failed to write to child: {exc}")
+                pending.clear()
+                ok = False
+                break
+            del pending[:n]
+        want = bool(pending)
+        if want != self.child_write_armed:
+            if want:
+                self.selector.register(fd, selectors.EVENT_WRITE)
+            else:
+                self.selector.unregister(fd)
+            self.child_write_armed = want
+        return ok
+
+    def forward_to_child(self, line: bytes) -> bool:
+        # Flushed once per host read by the caller, not per line.
+        return self.write_child(line + b"\n", flush=False)
+
+    def handle_child_stdout(self, lines: List[bytes]) -> None:
+        """
+        Every JSON-RPC line of one read goes out in a single write+flush, so
+        a burst of responses costs one syscall instead of one per line.
+        """
+        batch = []
+        noise = []
+        for raw in lines:
+            if looks_like_jsonrpc(raw):
+                batch.append(raw + b"\n")
+            else:
+                noise.append(PREFIX_STDOUT + raw + b"\n")
+        if noise:
+            write_stderr(noise)
+        if batch:
+            out = sys.stdout.buffer
+            out.write(b"".join(batch))
+            out.flush()
+
+    def handle_child_stderr(self, lines: List[bytes]) -> None:
+        # The token only matters once; after that stderr is pure pass-through.
+        if not self.ready.is_set() and any(READY_MARK in raw for raw in lines):
+            self.mark_ready()
+        write_stderr([PREFIX_STDERR + raw + b"\n" for raw in lines])
+
+    def handle_parent_line(self, line: bytes) -> bool:
+        """
+        Route one host request: forward when ready, else answer it from the
+        bootstrap table or queue it. Returns False once host input should stop.
+        """
+        if not line:
+            return True
+        if self.ready.is_set() and not may_end_session(line):
+            # Pass-through: the child parses the request itself.
+            return self.forward_to_child(line)
+
+        try:
+            req = json.loads(line)
+        except Exception:
+            log_err(f"[proxy] invalid JSON from parent: {line.decode('utf-8', errors='replace')}")
+            return True
+
+        if not isinstance(req, dict):
+            # Batches and other non-object values: the child answers them.
+            if self.ready.is_set() or not self.enqueue_request(None, line):
+                return self.forward_to_child(line)
+            return True
+
+        method = req.get("method")
+        if not isinstance(method, str):
+            method = None  # never a bootstrap method; the child reports the error
+        if method == "exit":
+            self.shutdown.set()
+        if method == "shutdown":
+            self.shutdown.set()
 
-    def mark_ready(self) -> None:
         if not self.ready.is_set():
-            self.ready.set()
-        if not self.flushed_on_ready:
-            self.flush_queued()
+            resp = bootstrap_response(method, req.get("id"))
+            if resp:
+                self.replies.append(resp)
+                if method in ("shutdown", "exit"):
+                    self.shutdown.set()
+                    return False
+                return True
+            rid = id_bytes(req.get("id")) if "id" in req else None
+            if self.enqueue_request(rid, line):
+                if method == "tools/call":
+                    log_err(f"[proxy] queued tools/call id={rid.decode() if rid else None} (booting)")
+                return True
+            # Became ready while this line was parsed: forward it below.
+
+        if not self.forward_to_child(line):
+            return False
+
+        if method in ("shutdown", "exit"):
+            self.shutdown.set()
+            return False
+        return True
+
+    def route_parent_lines(self, lines: List[bytes]) -> bool:
+        """
+        handle_parent_line over one read's lines. A line that raises is
+        logged and skipped rather than taking the whole proxy down.
+        """
+        for line in lines:
+            try:
+                if not self.handle_parent_line(line.strip()):
+                    return False
+            except Exception as exc:
+                log_err(f"[proxy] failed to handle host line: {exc!r}")
+        return True
+
+    def relay_child(self, handler: Callable[[List[bytes]], None], lines: List[bytes]) -> None:
+        try:
+            handler(lines)
+        except Exception as exc:
+            log_err(f"[proxy] failed to relay child output: {exc!r}")
+
+    def send_replies(self) -> None:
+        if not self.replies:
+            return
+        out = sys.stdout.buffer
+        out.write(b"".join(self.replies))
+        out.flush()
+        self.replies.clear()
+
+    def finish_parent_stdin(self) -> None:
+        self.shutdown.set()
 
     def pump_child_stdout(self) -> None:
         assert self.child and self.child.stdout
-        for line in self.child.stdout:
-            if looks_like_jsonrpc(line):
-                sys.stdout.write(line)
-                sys.stdout.flush()
-            else:
-                sys.stderr.write(f"[child-stdout] {line}")
-                sys.stderr.flush()
+        for lines in read_lines(self.child.stdout.fileno()):
+            self.relay_child(self.handle_child_stdout, lines)
 
     def pump_child_stderr(self) -> None:
         assert self.child and self.child.stderr
-        for line in self.child.stderr:
-            if READY_TOKEN in line:
-                self.mark_ready()
-            sys.stderr.write(f"[child-stderr] {line}")
-            sys.stderr.flush()
+        for lines in read_lines(self.child.stderr.fileno()):
+            self.relay_child(self.handle_child_stderr, lines)
 
     def handle_parent_stdin(self) -> None:
         """
         Consume parent stdin lines; if ready, forward; else handle bootstrap or queue.
         """
-        for raw in sys.stdin:
-            line = raw.strip()
-            if not line:
-                continue
-            try:
-                req = json.loads(line)
-            except Exception:
-                log_err(f"[proxy] invalid JSON from parent: {line}")
-                continue
-
-            method = req.get("method")
-            if method == "exit":
-                self.shutdown.set()
-            if method == "shutdown":
-                self.shutdown.set()
-
-            if not self.ready.is_set():
-                resp = bootstrap_response(req)
-                if resp:
-                    sys.stdout.write(json.dumps(resp) + "\n")
-                    sys.stdout.flush()
-                    if method in ("shutdown", "exit"):
-                        self.shutdown.set()
-                        break
-                    continue
-                if method == "tools/call":
-                    self.enqueue_request(req.get("id"), line)
-                    log_err(f"[proxy] queued tools/call id={req.get('id')} (booting)")
-                else:
-                    self.enqueue_request(req.get("id"), line)
-                continue
-
-            try:
-                self.child.stdin.write(line + "\n")
-                self.child.stdin.flush()
-            except Exception as exc:
-                log_err(f"[proxy] failed to write to child: {exc}")
+        for lines in read_lines(sys.stdin.fileno()):
+            more = self.route_parent_lines(lines)
+            self.send_replies()
+            if not self.flush_child() or not more:
                 break
+        self.finish_parent_stdin()
 
-            if method in ("shutdown", "exit"):
-                self.shutdown.set()
-                break
-        if self.ready.is_set():
-            self.flush_queued()
-        self.shutdown.set()
-
-    def run(self) -> int:
-        self.start_child()
-
+    def run_threads(self) -> int:
         stdout_thread = threading.Thread(target=self.pump_child_stdout, daemon=True)
         stderr_thread = threading.Thread(target=self.pump_child_stderr, daemon=True)
         stdin_thread = threading.Thread(target=self.handle_parent_stdin, daemon=True)
@@ -294,29 +535,103 @@ class Proxy:
 
         code = self.child.wait()
         self.shutdown.set()
-        if not self.ready.is_set():
-            with self.queue_lock:
-                queued = list(self.queue)
-                self.queue.clear()
-            for req_id, _ in queued:
-                if req_id is None:
-                    continue
-                err_resp = {
-                    "jsonrpc": "2.0",
-                    "id": req_id,
-                    "result": {
-                        "isError": True,
-                        "content": [{"type": "text", "text": "Backend exited before ready"}],
-                    },
-                }
-                sys.stdout.write(json.dumps(err_resp) + "\n")
-                sys.stdout.flush()
+        self.fail_queued()
 
         stdout_thread.join(timeout=1)
         stderr_thread.join(timeout=1)
         stdin_thread.join(timeout=1)
         return code
 
+    def run_selector(self, sel: selectors.BaseSelector) -> int:
+        """
+        Single-threaded pump: one selector over host stdin and the child's
+        stdout/stderr, 64 KiB reads from whichever is ready. Returns once the
+        child has closed both output pipes and exited.
+        """
+        host_fd = sys.stdin.fileno()
+        out_fd = self.child.stdout.fileno()
+        err_fd = self.child.stderr.fileno()
+        os.set_blocking(self.child.stdin.fileno(), False)
+        self.selector = sel
+        splitters = {host_fd: LineSplitter(), out_fd: LineSplitter(), err_fd: LineSplitter()}
+        sel.register(out_fd, selectors.EVENT_READ)
+        sel.register(err_fd, selectors.EVENT_READ)
+        outputs = {out_fd, err_fd}
+
+        try:
+            while outputs:
+                for key, events in sel.select():
+                    fd = key.fd
+                    if events & selectors.EVENT_WRITE:
+                        self.drain_child_writes()
+                        continue
+                    chunk = os.read(fd, 65536)
+                    lines = splitters[fd].feed(chunk) if chunk else splitters[fd].flush()
+                    if fd == host_fd:
+                        more = self.route_parent_lines(lines)
+                        self.send_replies()
+                        self.flush_child()
+                        if not chunk or not more:
+                            sel.unregister(fd)
+                            self.finish_parent_stdin()
+                        continue
+                    if fd == out_fd:
+                        self.relay_child(self.handle_child_stdout, lines)
+                    else:
+                        self.relay_child(self.handle_child_stderr, lines)
+                    if not chunk:
+                        sel.unregister(fd)
+                        outputs.discard(fd)
+        except BaseException:
+            # The loop is the only reader of the child's pipes: don't leave
+            # Blender running orphaned behind a dead proxy.
+            self.stop_child()
+            raise
+
+        code = self.child.wait()
+        self.shutdown.set()
+        self.fail_queued()
+        return code
+
+    def stop_child(self) -> None:
+        try:
+            self.child.terminate()
+            self.child.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.child.kill()
+        except Exception as exc:
+            log_err(f"[proxy] failed to stop child: {exc!r}")
+
+    def fail_queued(self) -> None:
+        if self.ready.is_set():
+            return
+        errors = [
+            b'{"jsonrpc":"2.0","id":' + req_id + BACKEND_EXITED_TAIL
+            for req_id, _ in self.drain_queue()
+            if req_id is not None and req_id != b"null"
+        ]
+        if errors:
+            sys.stdout.buffer.write(b"".join(errors))
+            sys.stdout.buffer.flush()
+
+    def run(self) -> int:
+        self.start_child()
+        # Windows selectors only accept sockets, so pipes keep one thread each.
+        if os.name == "nt":
+            return self.run_threads()
+        sel = selectors.DefaultSelector()
+        try:
+            sel.register(sys.stdin.fileno(), selectors.EVENT_READ)
+        except (OSError, ValueError):
+            # e.g. host stdin redirected from a regular file: not pollable
+            sel.close()
+            return self.run_threads()
+        try:
+            return self.run_selector(sel)
+        finally:
+            sel.close()
+            self.selector = None
+
 
 def main(argv: List[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Bootstrapping MCP stdio proxy.")